@@ -2,9 +2,181 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
-import csv
 import math
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+# =================================================================================
+#  SEGMENT TREE KERNELS
+# =================================================================================
+# The hot paths of the Segment Tree are pure integer arithmetic over its node
+# arrays, so they live here as module-level functions that Numba compiles to
+# native code. Numba is a requirement (see requirements.txt): without it the
+# tree uses the compiled Cython core from segtree_c.pyx when it has been
+# built, and otherwise runs these same functions as plain Python, which works
+# but is several times slower than a list-based tree.
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    from segtree_c import SegmentTreeC
+except ImportError:
+    SegmentTreeC = None
+
+
+@njit(cache=True, inline='always')
+def _st_combine(max_v1, max_i1, min_v1, min_i1, sum1, max_v2, max_i2, min_v2, min_i2, sum2):
+    """ Combines two nodes given as scalars. Each comparison is used as a 0/1
+    mask to pick its side arithmetically, so there is no data-dependent
+    branch to mispredict; the int64 sentinels keep the masking exact. """
+    # Combine max value and its index (ties keep the left, earlier day)
+    take_left = max_v1 >= max_v2
+    new_max_v = take_left * max_v1 + (1 - take_left) * max_v2
+    new_max_i = take_left * max_i1 + (1 - take_left) * max_i2
+
+    # Combine min value and its index
+    take_left = min_v1 <= min_v2
+    new_min_v = take_left * min_v1 + (1 - take_left) * min_v2
+    new_min_i = take_left * min_i1 + (1 - take_left) * min_i2
+
+    return new_max_v, new_max_i, new_min_v, new_min_i, sum1 + sum2
+
+
+@njit(cache=True)
+def _st_merge_into(max_v, max_i, min_v, min_i, sum_, dst, left, right):
+    """ Merges nodes `left` and `right` into node `dst`, in place. """
+    max_v[dst], max_i[dst], min_v[dst], min_i[dst], sum_[dst] = _st_combine(
+        max_v[left], max_i[left], min_v[left], min_i[left], sum_[left],
+        max_v[right], max_i[right], min_v[right], min_i[right], sum_[right])
+
+
+@njit(cache=True, inline='always')
+def _st_pull(max_v, max_i, min_v, min_i, sum_, node):
+    """ Rebuilds `node` from its children; the child indices are computed
+    once, with shifts. """
+    left = node << 1
+    _st_merge_into(max_v, max_i, min_v, min_i, sum_, node, left, left | 1)
+
+
+@njit(cache=True)
+def _st_apply_lazy(max_v, min_v, sum_, lazy, size, node, width, val):
+    """ Adds `val` to every element under `node` (which spans `width` leaves)
+    and records it as pending for the node's children. """
+    max_v[node] += val
+    min_v[node] += val
+    sum_[node] += val * width
+    if node < size: # Mark children as lazy
+        lazy[node] += val
+
+
+@njit(cache=True)
+def _st_push(max_v, min_v, sum_, lazy, size, node, width):
+    """ Hands the pending addition at `node` down to its two children. """
+    if lazy[node] != 0:
+        left, half = node << 1, width >> 1
+        _st_apply_lazy(max_v, min_v, sum_, lazy, size, left, half, lazy[node])
+        _st_apply_lazy(max_v, min_v, sum_, lazy, size, left | 1, half, lazy[node])
+        lazy[node] = 0
+
+
+@njit(cache=True)
+def _st_push_boundaries(max_v, min_v, sum_, lazy, size, log, l, r):
+    """ Pushes, top-down, every ancestor of the half-open leaf range [l, r)
+    that only partially overlaps it. """
+    for i in range(log, 0, -1):
+        if ((l >> i) << i) != l: _st_push(max_v, min_v, sum_, lazy, size, l >> i, 1 << i)
+        if ((r >> i) << i) != r: _st_push(max_v, min_v, sum_, lazy, size, (r - 1) >> i, 1 << i)
+
+
+@njit(cache=True)
+def _st_query(max_v, max_i, min_v, min_i, sum_, lazy, size, log, l, r):
+    """ Iterative bottom-up query over [l, r]. Node 0 is never used by the
+    tree and keeps the empty-node sentinels, so it seeds the running bests. """
+    l += size
+    r += size + 1
+    _st_push_boundaries(max_v, min_v, sum_, lazy, size, log, l, r)
+
+    # Nodes are met left to right from the left end and right to left from
+    # the right end; the comparisons are chosen so ties keep the earlier day
+    left_max = left_min = right_max = right_min = 0
+    left_sum = right_sum = 0
+    while l < r:
+        if l & 1:
+            left_max = l if max_v[l] > max_v[left_max] else left_max
+            left_min = l if min_v[l] < min_v[left_min] else left_min
+            left_sum += sum_[l]
+            l += 1
+        if r & 1:
+            r -= 1
+            right_max = r if max_v[r] >= max_v[right_max] else right_max
+            right_min = r if min_v[r] <= min_v[right_min] else right_min
+            right_sum += sum_[r]
+        l >>= 1
+        r >>= 1
+
+    return _st_combine(max_v[left_max], max_i[left_max], min_v[left_min], min_i[left_min], left_sum,
+                       max_v[right_max], max_i[right_max], min_v[right_min], min_i[right_min], right_sum)
+
+
+@njit(cache=True)
+def _st_update_range_add(max_v, max_i, min_v, min_i, sum_, lazy, size, log, l, r, val):
+    """ Iterative bottom-up range addition over [l, r]. """
+    l += size
+    r += size + 1
+    _st_push_boundaries(max_v, min_v, sum_, lazy, size, log, l, r)
+
+    lo, hi, width = l, r, 1
+    while lo < hi:
+        if lo & 1:
+            _st_apply_lazy(max_v, min_v, sum_, lazy, size, lo, width, val)
+            lo += 1
+        if hi & 1:
+            hi -= 1
+            _st_apply_lazy(max_v, min_v, sum_, lazy, size, hi, width, val)
+        lo >>= 1
+        hi >>= 1
+        width <<= 1
+
+    # Update parents from children, bottom-up. Once both boundaries share
+    # an ancestor it only needs rebuilding once per level
+    for i in range(1, log + 1):
+        left_node = 0
+        if ((l >> i) << i) != l:
+            left_node = l >> i
+            _st_pull(max_v, max_i, min_v, min_i, sum_, left_node)
+        if ((r >> i) << i) != r and ((r - 1) >> i) != left_node:
+            _st_pull(max_v, max_i, min_v, min_i, sum_, (r - 1) >> i)
+
+
+@njit(cache=True)
+def _st_update_point(max_v, max_i, min_v, min_i, sum_, lazy, size, log, idx, val):
+    """ Iterative point update: the leaf's ancestors are exactly leaf >> i, so
+    the path is pushed top-down, the leaf is set, and the path is re-merged
+    bottom-up. The re-merge stops at the first node that comes out unchanged,
+    since nothing above it can change either. """
+    leaf = idx + size
+    for i in range(log, 0, -1):
+        _st_push(max_v, min_v, sum_, lazy, size, leaf >> i, 1 << i)
+
+    if max_v[leaf] == val:
+        return
+    max_v[leaf] = min_v[leaf] = sum_[leaf] = val
+    max_i[leaf] = min_i[leaf] = idx
+
+    for i in range(1, log + 1):
+        node = leaf >> i
+        old = (max_v[node], max_i[node], min_v[node], min_i[node], sum_[node])
+        _st_pull(max_v, max_i, min_v, min_i, sum_, node)
+        if (max_v[node], max_i[node], min_v[node], min_i[node], sum_[node]) == old:
+            break
 
 # =================================================================================
 #  ADVANCED SEGMENT TREE BACKEND
@@ -14,18 +186,23 @@ class SegmentTree:
     An advanced Segment Tree supporting complex nodes and lazy propagation
     for range additions. Designed for a 4-member team.
 
+    The class owns the node arrays and hands them to the compiled kernels
+    above for every query and update (or to the Cython core, which works
+    on the same arrays, when Numba is missing).
+
     Time Complexity Summary:
     - __init__: O(n) for building the tree.
-    - _merge_nodes: O(1) for merging two nodes.
     - _build: O(n) for constructing the tree.
     - query: O(log n) for querying a range.
-    - _query_recursive: O(log n) for recursive query.
-    - _apply_lazy: O(1) for applying lazy updates.
+    - query_many: O(k log n) for k ranges, run as O(log n) vector steps.
     - update_range_add: O(log n) for range addition.
-    - _update_range_recursive: O(log n) for recursive range update.
     - update_point: O(log n) for point update.
-    - _update_point_recursive: O(log n) for recursive point update.
+    - _st_merge_into / _st_apply_lazy / _st_push: O(1) per node.
     """
+    # Fixed attribute set: no per-instance __dict__, and faster attribute reads
+    __slots__ = ('data', 'n', 'size', 'log', 'default_node',
+                 'max_v', 'max_i', 'min_v', 'min_i', 'sum_', 'lazy', '_core')
+
     # Member 1: The Core Architect & Builder
     # -----------------------------------------------------------------------------
     def __init__(self, data):
@@ -34,67 +211,78 @@ class SegmentTree:
         Sets up the main data array, the tree for storing complex nodes,
         and the lazy array for pending updates.
 
-        
+        The tree is stored as five parallel NumPy arrays (one per node field)
+        rather than a list of tuples, so merges become indexed loads/stores.
+        Nodes are heap-indexed: the root is 1, node k has children 2k and
+        2k + 1, and the leaves sit at [size, 2 * size) where size is n rounded
+        up to a power of two.
         """
-        self.data = data
+        self.data = np.array(data, dtype=np.int32) # Owned int32 copy; range edits are one slice op
         self.n = len(data)
+        self.size = 1 if self.n <= 1 else 1 << (self.n - 1).bit_length()
+        self.log = self.size.bit_length() - 1
         
         # Default node: (max_val, max_idx, min_val, min_idx, sum)
         self.default_node = (-math.inf, -1, math.inf, -1, 0)
         
-        # The tree stores the merged node data
-        self.tree = [self.default_node] * (4 * self.n)
+        # The tree stores the merged node data, one array per field.
+        # Temperatures are integral, so unused nodes (including the padding
+        # leaves past n) use the int64 extremes in place of -inf/+inf.
+        size = 2 * self.size
+        self.max_v = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+        self.max_i = np.full(size, -1, dtype=np.int64)
+        self.min_v = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        self.min_i = np.full(size, -1, dtype=np.int64)
+        self.sum_ = np.zeros(size, dtype=np.int64)
         
-        # The lazy array stores pending additions for a range
-        self.lazy = [0] * (4 * self.n)
+        # The lazy array stores additions already applied to a node but
+        # still pending for its children, so only internal nodes [1, size)
+        # need a slot
+        self.lazy = np.zeros(self.size, dtype=np.int64)
         
         if self.n > 0:
-            self._build(0, 0, self.n - 1)
-
-    def _merge_nodes(self, left_node, right_node):
-        """
-        Responsibility 1.2: Merge two child nodes into a parent node.
-        This logic is crucial for building and updating the tree correctly.
-
-        """
-        # Unpack children
-        max_v1, max_i1, min_v1, min_i1, sum1 = left_node
-        max_v2, max_i2, min_v2, min_i2, sum2 = right_node
+            self._build()
 
-        # Combine max value and its index
-        if max_v1 >= max_v2:
-            new_max_v, new_max_i = max_v1, max_i1
-        else:
-            new_max_v, new_max_i = max_v2, max_i2
-
-        # Combine min value and its index
-        if min_v1 <= min_v2:
-            new_min_v, new_min_i = min_v1, min_i1
-        else:
-            new_min_v, new_min_i = min_v2, min_i2
-            
-        # Combine sum
-        new_sum = sum1 + sum2
-        
-        return (new_max_v, new_max_i, new_min_v, new_min_i, new_sum)
+        # Compiled C fallback for the hot paths when Numba is not available
+        self._core = None
+        if SegmentTreeC is not None and not HAVE_NUMBA:
+            self._core = SegmentTreeC(self.max_v, self.max_i, self.min_v, self.min_i, self.sum_, self.lazy,
+                                      self.size, self.log)
 
-    def _build(self, node, start, end):
+    def _build(self):
         """
-        Responsibility 1.3: Recursively construct the Segment Tree.
+        Responsibility 1.3: Construct the Segment Tree.
         Builds the tree from the bottom up using the merge logic.
 
+        The leaves are copied in with one slice assignment, then each level
+        is reduced from the one below it with whole-slice NumPy operations,
+        so the build costs O(log n) vectorized steps instead of O(n) calls.
+
         Time Complexity: O(n), where n is the number of elements in the data.
         This is because each element is processed once during the build.
         """
-        if start == end:
-            val = self.data[start]
-            self.tree[node] = (val, start, val, start, val)
-            return
-        
-        mid = (start + end) // 2
-        self._build(2 * node + 1, start, mid)
-        self._build(2 * node + 2, mid + 1, end)
-        self.tree[node] = self._merge_nodes(self.tree[2 * node + 1], self.tree[2 * node + 2])
+        max_v, max_i, min_v, min_i, sum_ = self.max_v, self.max_i, self.min_v, self.min_i, self.sum_
+        leaves = slice(self.size, self.size + self.n)
+        max_v[leaves] = min_v[leaves] = sum_[leaves] = self.data
+        max_i[leaves] = min_i[leaves] = np.arange(self.n)
+
+        p = self.size // 2
+        while p >= 1:
+            # Nodes [p, 2p) have their left children at the even and their
+            # right children at the odd positions of [2p, 4p)
+            parent, left, right = slice(p, 2 * p), slice(2 * p, 4 * p, 2), slice(2 * p + 1, 4 * p, 2)
+
+            # Ties keep the left, earlier day (same rule as _st_merge_into)
+            take_left = max_v[left] >= max_v[right]
+            max_v[parent] = np.where(take_left, max_v[left], max_v[right])
+            max_i[parent] = np.where(take_left, max_i[left], max_i[right])
+
+            take_left = min_v[left] <= min_v[right]
+            min_v[parent] = np.where(take_left, min_v[left], min_v[right])
+            min_i[parent] = np.where(take_left, min_i[left], min_i[right])
+
+            np.add(sum_[left], sum_[right], out=sum_[parent])
+            p //= 2
 
     # Member 2: The Query Specialist
     # -----------------------------------------------------------------------------
@@ -104,45 +292,79 @@ class SegmentTree:
         This provides the final, merged node for a given range [l, r].
         The GUI will then extract max, min, or average from this result.
 
+        Responsibility 2.3: Pending lazy values on the way are pushed down
+        by the kernel. The result tuple is only built here, at the API
+        boundary.
         """
+        l, r = max(l, 0), min(r, self.n - 1)
         if l > r: return self.default_node
-        return self._query_recursive(0, 0, self.n - 1, l, r)
-
-    def _query_recursive(self, node, start, end, l, r):
-        """ The recursive workhorse for the query function. """
-        # Apply lazy propagation before querying
-        if self.lazy[node] != 0:
-            self._apply_lazy(node, start, end, self.lazy[node])
-            self.lazy[node] = 0
-
-        # No overlap
-        if start > r or end < l:
-            return self.default_node
-        
-        # Total overlap
-        if l <= start and end <= r:
-            return self.tree[node]
-
-        # Partial overlap
-        mid = (start + end) // 2
-        left_result = self._query_recursive(2 * node + 1, start, mid, l, r)
-        right_result = self._query_recursive(2 * node + 2, mid + 1, end, l, r)
-        
-        return self._merge_nodes(left_result, right_result)
-
-
-    def _apply_lazy(self, node, start, end, val):
+        if self._core is not None:
+            return self._core.query(l, r)
+        max_v, max_i, min_v, min_i, total = _st_query(
+            self.max_v, self.max_i, self.min_v, self.min_i, self.sum_, self.lazy,
+            self.size, self.log, l, r)
+        return (int(max_v), int(max_i), int(min_v), int(min_i), int(total))
+
+    def query_many(self, ls, rs):
         """
-        Responsibility 2.3 (Helper): Applies a lazy value to a node's data.
-        Updates max, min, and sum based on the value to add.
-
+        Responsibility 2.4: Answers a batch of range queries [ls[j], rs[j]]
+        at once (e.g. one per month), returning the node fields as five
+        arrays (max_v, max_i, min_v, min_i, sum) with one entry per query.
+        Empty ranges come back with index -1 and a sum of 0.
+
+        Runs the same bottom-up walk as query, but on whole arrays of
+        boundaries at a time, so each tree level costs a few NumPy
+        operations instead of one Python call per query.
         """
-        max_v, max_i, min_v, min_i, current_sum = self.tree[node]
-        range_size = end - start + 1
-        self.tree[node] = (max_v + val, max_i, min_v + val, min_i, current_sum + val * range_size)
-        if start != end: # Mark children as lazy
-            self.lazy[2 * node + 1] += val
-            self.lazy[2 * node + 2] += val
+        max_v, max_i, min_v, min_i, sum_, lazy = self.max_v, self.max_i, self.min_v, self.min_i, self.sum_, self.lazy
+        l = np.clip(np.asarray(ls, dtype=np.int64), 0, self.n) + self.size
+        r = np.clip(np.asarray(rs, dtype=np.int64), -1, self.n - 1) + self.size + 1
+        live = l < r
+
+        # Push the boundary ancestors top-down; queries sharing an ancestor
+        # share its push
+        for i in range(self.log, 0, -1):
+            lb, rb = l[live], r[live]
+            nodes = np.unique(np.concatenate((lb[((lb >> i) << i) != lb] >> i, (rb[((rb >> i) << i) != rb] - 1) >> i)))
+            nodes = nodes[lazy[nodes] != 0]
+            if nodes.size == 0:
+                continue
+            val = lazy[nodes]
+            for child in (nodes << 1, (nodes << 1) | 1):
+                max_v[child] += val
+                min_v[child] += val
+                sum_[child] += val << (i - 1)
+                if i > 1:
+                    lazy[child] += val
+            lazy[nodes] = 0
+
+        # Running bests are node indices; node 0 holds the empty sentinels,
+        # so queries that take no node in a step simply read node 0
+        k = len(l)
+        left_max, left_min, right_max, right_min = (np.zeros(k, dtype=np.int64) for _ in range(4))
+        total = np.zeros(k, dtype=np.int64)
+        for _ in range(self.log + 1):
+            active = l < r
+            take = active & ((l & 1) == 1)
+            node = np.where(take, l, 0)
+            left_max = np.where(max_v[node] > max_v[left_max], node, left_max)
+            left_min = np.where(min_v[node] < min_v[left_min], node, left_min)
+            total += sum_[node]
+            l += take
+
+            take = active & ((r & 1) == 1)
+            r -= take
+            node = np.where(take, r, 0)
+            right_max = np.where(max_v[node] >= max_v[right_max], node, right_max)
+            right_min = np.where(min_v[node] <= min_v[right_min], node, right_min)
+            total += sum_[node]
+
+            l >>= 1
+            r >>= 1
+
+        best_max = np.where(max_v[left_max] >= max_v[right_max], left_max, right_max)
+        best_min = np.where(min_v[left_min] <= min_v[right_min], left_min, right_min)
+        return max_v[best_max], max_i[best_max], min_v[best_min], min_i[best_min], total
 
 
     # Member 3: The Range Update Specialist (Lazy Propagation)
@@ -151,35 +373,18 @@ class SegmentTree:
         """
         Responsibility 3.1: Public method to add a value to a range.
         This is the entry point for the "heatwave" scenario.
-        """
-        if l > r: return
-        self._update_range_recursive(0, 0, self.n - 1, l, r, val)
 
-    def _update_range_recursive(self, node, start, end, l, r, val):
-        """
-        Responsibility 3.2 & 3.3: The main recursive range update function.
-        Finds the relevant nodes and applies updates to the lazy array.
+        Responsibility 3.2 & 3.3: The covering nodes take the addition as a
+        lazy value, then only the ancestors of the two boundaries are
+        rebuilt from their children.
         """
-        # First, apply any pending updates at this node
-        if self.lazy[node] != 0:
-            self._apply_lazy(node, start, end, self.lazy[node])
-            self.lazy[node] = 0 # Clear the lazy mark
-
-        # No overlap
-        if start > r or end < l: return
-        
-        # Total overlap: Apply update to current node and mark children as lazy
-        if l <= start and end <= r:
-            self._apply_lazy(node, start, end, val)
+        l, r = max(l, 0), min(r, self.n - 1)
+        if l > r: return
+        if self._core is not None:
+            self._core.update_range_add(l, r, val)
             return
-
-        # Partial overlap: Recurse on children
-        mid = (start + end) // 2
-        self._update_range_recursive(2 * node + 1, start, mid, l, r, val)
-        self._update_range_recursive(2 * node + 2, mid + 1, end, l, r, val)
-        
-        # Update parent from children after recursion
-        self.tree[node] = self._merge_nodes(self.tree[2 * node + 1], self.tree[2 * node + 2])
+        _st_update_range_add(self.max_v, self.max_i, self.min_v, self.min_i, self.sum_, self.lazy,
+                             self.size, self.log, l, r, val)
         
     # Member 4: The Point Updater & GUI Integrator
     # -----------------------------------------------------------------------------
@@ -187,36 +392,17 @@ class SegmentTree:
         """
         Responsibility 4.1: Public method to update a single point.
         Used for correcting a single day's temperature.
+
+        Responsibility 4.2 & 4.3: The kernel walks the leaf's ancestor path,
+        pushing lazy values down and then re-merging it bottom-up.
         """
         if not (0 <= idx < self.n): return
         self.data[idx] = val
-        self._update_point_recursive(0, 0, self.n - 1, idx)
-
-    def _update_point_recursive(self, node, start, end, idx):
-        """
-        Responsibility 4.2 & 4.3: The recursive point update function.
-        Similar to build, but only follows the path to a single leaf.
-        """
-        # Push lazy values down the path to the point we are updating
-        if self.lazy[node] != 0:
-            self._apply_lazy(node, start, end, self.lazy[node])
-            self.lazy[node] = 0
-
-        if start == end:
-            self.tree[node] = (self.data[idx], idx, self.data[idx], idx, self.data[idx])
+        if self._core is not None:
+            self._core.update_point(idx, val)
             return
-            
-        mid = (start + end) // 2
-        if start <= idx <= mid:
-            # Before recursing, ensure children of the other path are up-to-date
-            if self.lazy[2*node+1] != 0: self._apply_lazy(2*node+1, start, mid, self.lazy[2*node+1]); self.lazy[2*node+1] = 0
-            self._update_point_recursive(2 * node + 1, start, mid, idx)
-        else:
-            # Before recursing, ensure children of the other path are up-to-date
-            if self.lazy[2*node+2] != 0: self._apply_lazy(2*node+2, mid+1, end, self.lazy[2*node+2]); self.lazy[2*node+2] = 0
-            self._update_point_recursive(2 * node + 2, mid + 1, end, idx)
-            
-        self.tree[node] = self._merge_nodes(self.tree[2 * node + 1], self.tree[2 * node + 2])
+        _st_update_point(self.max_v, self.max_i, self.min_v, self.min_i, self.sum_, self.lazy,
+                         self.size, self.log, idx, val)
 
 # =================================================================================
 #  GUI (Responsibility of Member 4)
@@ -227,6 +413,11 @@ class WeatherApp(ctk.CTk):
         self.weather_data = weather_data
         self.num_days = len(weather_data)
         self.weather_tree = SegmentTree(self.weather_data)
+
+        # Plot windows are kept and refreshed in place while they stay open
+        self._graph_fig = self._graph_ax = self._graph_line = self._graph_fill = None
+        self._tree_fig = self._tree_ax = None
+        self._tree_layout = {} # node_idx -> (x, y, dx, dy); depends only on the index
         
         self.title("☀️ Advanced Weather Analysis Dashboard"); self.geometry("850x750") # Increased height for new button
         ctk.set_appearance_mode("light"); ctk.set_default_color_theme("blue")
@@ -245,7 +436,13 @@ class WeatherApp(ctk.CTk):
         query_frame = ctk.CTkFrame(controls_frame)
         query_frame.pack(pady=15, padx=20, fill="x")
         ctk.CTkLabel(query_frame, text="Analyze Date Range", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=10)
-        self.query_type = ctk.CTkOptionMenu(query_frame, values=["Max Temperature", "Min Temperature", "Average Temperature"])
+        # Result formatter per query type, looked up directly by the selected option
+        self._q_formatters = {
+            "Max Temperature": lambda node, start, end: f"✅ Max Temp: {node[0]}°C (on Day {node[1]})",
+            "Min Temperature": lambda node, start, end: f"✅ Min Temp: {node[2]}°C (on Day {node[3]})",
+            "Average Temperature": lambda node, start, end: f"✅ Average Temp: {round(node[4] / (end - start + 1), 2)}°C from Day {start} to {end}",
+        }
+        self.query_type = ctk.CTkOptionMenu(query_frame, values=list(self._q_formatters))
         self.query_type.pack(pady=10, padx=10, fill="x")
         self.start_day_entry = ctk.CTkEntry(query_frame, placeholder_text="Start Day")
         self.start_day_entry.pack(pady=5, padx=10, fill="x")
@@ -291,52 +488,64 @@ class WeatherApp(ctk.CTk):
     # ### START OF NEW CODE ###
     def visualize_tree(self):
         """Generates a plot of the segment tree structure."""
-        fig, ax = plt.subplots(figsize=(15, 10))
+        if self._tree_fig is None or not plt.fignum_exists(self._tree_fig.number):
+            self._tree_fig, self._tree_ax = plt.subplots(figsize=(15, 10))
+        ax = self._tree_ax
+        ax.clear()
         ax.set_title("Segment Tree Structure (Top 4 Levels)", fontsize=16)
         ax.axis('off')
         
-        # Start the recursive drawing from the root node (index 0)
-        self._draw_node_recursive(ax, 0, 0, 0, 1.0, 0.5, 0)
-        
-        plt.tight_layout()
-        plt.show()
-
-    def _draw_node_recursive(self, ax, node_idx, x, y, dx, dy, depth):
-        """Recursively draws a node and its children."""
-        MAX_DEPTH = 4 
-        if depth >= MAX_DEPTH or node_idx >= len(self.weather_tree.tree):
-            return
-
-        # Get node data and format it for display
-        node_data = self.weather_tree.tree[node_idx]
-        max_v, _, min_v, _, total_sum = node_data
-        
-        # Check if the node is a default/empty node
-        if max_v == -math.inf:
-            return
-
-        # Format text for the node
-        node_text = f"Max: {max_v}\nMin: {min_v}\nSum: {total_sum}"
-        
-        # Define properties for the node's appearance
+        # Collect every visible node and edge first, then hand them to matplotlib in bulk
+        xs, ys, texts, segments = self._collect_tree_nodes()
+        ax.add_collection(LineCollection(segments, colors='k', zorder=1))
+        ax.scatter(xs, ys, s=20, c='k', zorder=2)
         bbox_props = dict(boxstyle="round,pad=0.5", fc="lightblue", ec="black", lw=1)
-        ax.text(x, y, node_text, ha="center", va="center", bbox=bbox_props, fontsize=9)
-        
-        # Calculate positions for children
-        left_child_idx = 2 * node_idx + 1
-        right_child_idx = 2 * node_idx + 2
+        for x, y, node_text in zip(xs, ys, texts):
+            ax.annotate(node_text, (x, y), ha="center", va="center", bbox=bbox_props, fontsize=9, zorder=3)
+        ax.autoscale_view()
         
-        # Draw left child and the connecting line
-        if left_child_idx < len(self.weather_tree.tree):
-            x_left, y_child = x - dx, y - dy
-            ax.plot([x, x_left], [y, y_child], 'k-')
-            self._draw_node_recursive(ax, left_child_idx, x_left, y_child, dx/2, dy, depth + 1)
-            
-        # Draw right child and the connecting line
-        if right_child_idx < len(self.weather_tree.tree):
-            x_right, y_child = x + dx, y - dy
-            ax.plot([x, x_right], [y, y_child], 'k-')
-            self._draw_node_recursive(ax, right_child_idx, x_right, y_child, dx/2, dy, depth + 1)
+        self._tree_fig.tight_layout()
+        self._tree_fig.canvas.draw_idle()
+        plt.show(block=False)
+
+    def _node_layout(self, node_idx):
+        """Returns the memoized (x, y, dx, dy) drawing position of a node."""
+        layout = self._tree_layout.get(node_idx)
+        if layout is None:
+            if node_idx == 1:
+                layout = (0, 0, 1.0, 0.5)
+            else:
+                x, y, dx, dy = self._node_layout(node_idx // 2)
+                layout = (x - dx if node_idx % 2 == 0 else x + dx, y - dy, dx / 2, dy)
+            self._tree_layout[node_idx] = layout
+        return layout
+
+    def _collect_tree_nodes(self):
+        """Walks the top levels breadth-first from the root (index 1) and returns
+        the x/y positions and labels of the drawable nodes plus the edge segments."""
+        MAX_DEPTH = 4
+        tree = self.weather_tree
+        n_nodes = len(tree.max_v)
+        xs, ys, texts, segments = [], [], [], []
+        level = [1]
+        for _ in range(MAX_DEPTH):
+            next_level = []
+            for node_idx in level:
+                # Empty (padding) nodes are skipped together with their subtrees
+                if tree.max_i[node_idx] == -1:
+                    continue
+                x, y, _, _ = self._node_layout(node_idx)
+                xs.append(x)
+                ys.append(y)
+                texts.append(f"Max: {tree.max_v[node_idx]}\nMin: {tree.min_v[node_idx]}\nSum: {tree.sum_[node_idx]}")
+                for child_idx in (2 * node_idx, 2 * node_idx + 1):
+                    # No edge into padding: a child is drawn only if it holds a day
+                    if child_idx < n_nodes and tree.max_i[child_idx] != -1:
+                        x_child, y_child, _, _ = self._node_layout(child_idx)
+                        segments.append(((x, y), (x_child, y_child)))
+                        next_level.append(child_idx)
+            level = next_level
+        return xs, ys, texts, segments
     # ### END OF NEW CODE ###
 
     def perform_query(self):
@@ -349,17 +558,7 @@ class WeatherApp(ctk.CTk):
             # This is the crucial part that uses the Segment Tree
             result_node = self.weather_tree.query(start, end)
             
-            max_v, max_i, min_v, min_i, total_sum = result_node
-            q_type = self.query_type.get()
-            
-            if q_type == "Max Temperature":
-                self.result_label.configure(text=f"✅ Max Temp: {max_v}°C (on Day {max_i})")
-            elif q_type == "Min Temperature":
-                self.result_label.configure(text=f"✅ Min Temp: {min_v}°C (on Day {min_i})")
-            elif q_type == "Average Temperature":
-                count = end - start + 1
-                avg = round(total_sum / count, 2) if count > 0 else 0
-                self.result_label.configure(text=f"✅ Average Temp: {avg}°C from Day {start} to {end}")
+            self.result_label.configure(text=self._q_formatters[self.query_type.get()](result_node, start, end))
         except ValueError: messagebox.showerror("Invalid Input", "Please enter valid numbers.")
 
     def perform_range_update(self):
@@ -372,8 +571,7 @@ class WeatherApp(ctk.CTk):
             self.weather_tree.update_range_add(start, end, val)
             
             # After updating, the internal data array also needs to be updated for the display
-            for i in range(start, end + 1):
-                self.weather_tree.data[i] += val
+            self.weather_tree.data[start:end + 1] += val
 
             self.result_label.configure(text=f"✅ Applied {val:+}°C to days {start}-{end}.")
             self.refresh_data_display()
@@ -383,35 +581,43 @@ class WeatherApp(ctk.CTk):
         self.data_display.configure(state="normal")
         self.data_display.delete('1.0', tk.END)
         
-        # Display 10 numbers per line for better readability
-        data_str = ""
-        for i, val in enumerate(self.weather_tree.data):
-            data_str += f"{val:3d} "
-            if (i + 1) % 15 == 0:
-                data_str += "\n"
+        # Display 15 numbers per line for better readability; rows are
+        # formatted separately and joined once instead of growing one string
+        values = self.weather_tree.data.tolist()
+        rows = [" ".join(f"{val:3d}" for val in values[i:i + 15]) for i in range(0, len(values), 15)]
         
-        self.data_display.insert(tk.END, data_str)
+        self.data_display.insert(tk.END, "\n".join(rows))
         self.data_display.configure(state="disabled")
 
     def show_graph(self):
-        plt.style.use('seaborn-v0_8-whitegrid')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(range(self.num_days), self.weather_tree.data, color='#3498db', linewidth=2)
-        ax.set_title('Maximum Daily Temperatures Over a Year', fontsize=16)
-        ax.set_xlabel('Day of the Year'); ax.set_ylabel('Temperature (°C)')
-        ax.fill_between(range(self.num_days), self.weather_tree.data, color='#3498db', alpha=0.1)
-        plt.tight_layout(); plt.show()
+        days, temps = range(self.num_days), self.weather_tree.data.copy()
+        if self._graph_fig is None or not plt.fignum_exists(self._graph_fig.number):
+            plt.style.use('seaborn-v0_8-whitegrid')
+            self._graph_fig, self._graph_ax = plt.subplots(figsize=(10, 6))
+            ax = self._graph_ax
+            self._graph_line, = ax.plot(days, temps, color='#3498db', linewidth=2)
+            ax.set_title('Maximum Daily Temperatures Over a Year', fontsize=16)
+            ax.set_xlabel('Day of the Year'); ax.set_ylabel('Temperature (°C)')
+        else:
+            # Window still open: swap in the new data instead of re-plotting
+            self._graph_line.set_ydata(temps)
+            self._graph_fill.remove()
+            self._graph_ax.relim(); self._graph_ax.autoscale_view()
+        self._graph_fill = self._graph_ax.fill_between(days, temps, color='#3498db', alpha=0.1)
+        self._graph_fig.tight_layout(); self._graph_fig.canvas.draw_idle()
+        plt.show(block=False)
 
 # =========================================================
 #  APPLICATION BOOTSTRAP
 # =========================================================
 def load_data_from_csv(filename):
+    # NumPy's C parser reads the first column straight into one int32 array
     try:
-        with open(filename, 'r') as f: return [int(row[0]) for row in list(csv.reader(f))[1:]]
+        return np.loadtxt(filename, delimiter=',', skiprows=1, usecols=(0,), dtype=np.int32, ndmin=1)
     except FileNotFoundError: messagebox.showerror("Error", f"'{filename}' not found. Please create a CSV file with temperature data."); return None
     except Exception as e: messagebox.showerror("Error", f"Failed to load data: {e}"); return None
 
 if __name__ == "__main__":
-    if (weather_data := load_data_from_csv("yearly_weather_data.csv")):
+    if (weather_data := load_data_from_csv("yearly_weather_data.csv")) is not None and len(weather_data):
         app = WeatherApp(weather_data)
         app.mainloop()
\ No newline at end of file
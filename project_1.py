@@ -13,170 +13,630 @@
 #
 # Core Data Structure:
 # The backend is powered by a Segment Tree that supports lazy propagation.
-# Each node in the tree stores a tuple of aggregated data:
-# (max_value, max_index, min_value, min_index, sum, count).
+# Each node is one row of an int64 node table, holding the aggregated
+# (max_value, max_index, min_value, min_index, sum, count): the max and min
+# columns pack each value together with its day into a single key, followed
+# by the sum and count columns.
 # This structure allows for efficient range queries and enables "soft-deleting"
 # records without rebuilding the tree.
 #
 # Key Features:
 #   - Fast range queries for min, max, and average temperature (O(log n)).
 #   - Efficient single-day data recording, updating, and removal (O(log n)).
+#   - Bulk recording of a whole range of k days with lazy propagation
+#     (O(log n) in the tree plus an O(k) patch of the flat day arrays).
 #   - Linear scan for threshold-based alerts (O(n)).
-#   - Advanced seasonal analysis using a moving average algorithm (O(n log n)).
+#   - Advanced seasonal analysis using a prefix-sum moving average (O(n)).
 #
 # Usage:
 # Run the script from your terminal. It requires a 'yearly_weather_data.csv'
 # file in the same directory. The CSV should have a header row followed by
 # daily temperature readings, one per row.
+# Without arguments it starts the interactive menu; a subcommand runs a single
+# report instead, e.g. `python project_1.py query 0 364` or
+# `python project_1.py threshold above 30` (see --help).
 #
 # =================================================================================
+import argparse
 import math
-import csv
+import os
+import sys
+import numpy as np
 
 # =================================================================================
 #  ADVANCED SEGMENT TREE BACKEND
 # =================================================================================
+#
+# The tree lives in one int64 node table with a row per node and a column
+# per field, so everything a merge reads or writes for a node sits side by
+# side in memory. The hot paths are module-level functions over that table
+# that Numba compiles to native code. Numba is a requirement (see
+# requirements.txt): without it the same functions run as plain Python,
+# which works but is several times slower than a list-based tree.
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Node table columns
+MAX, MIN, SUM, COUNT = range(4)
+
+# Lazy tag table columns: a pending addition, and a pending assignment
+# (SET) that only counts while HAS_SET is 1
+ADD, SET, HAS_SET = range(3)
+
+# Empty-node sentinels: they lose every max/min comparison
+INT64_MIN = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+# MAX and MIN each pack a (value, day) pair into one int64 as
+# value * 2^32 + low word, so a single signed comparison orders by value and
+# then by day. The max key stores the day inverted, the min key stores it
+# as is: either way the earlier day wins a tie. A pending addition moves
+# only the value half (val << 32). Values must fit in 32 bits.
+IDX_MASK = 0xFFFFFFFF
+
+
+@njit(cache=True, inline='always')
+def _pack_max(val, idx):
+    return (val << 32) | (IDX_MASK - idx)
+
+
+@njit(cache=True, inline='always')
+def _pack_min(val, idx):
+    return (val << 32) | idx
+
+
+def unpack_max(key):
+    return key >> 32, IDX_MASK - (key & IDX_MASK)
+
+
+def unpack_min(key):
+    return key >> 32, key & IDX_MASK
+
+
+@njit(cache=True, inline='always')
+def _st_merge_rows(dst, left, right):
+    """ Writes the merge of node rows `left` and `right` into row `dst`; the
+    packed keys make it a plain max/min with no index selection. """
+    dst[MAX] = max(left[MAX], right[MAX])
+    dst[MIN] = min(left[MIN], right[MIN])
+    dst[SUM] = left[SUM] + right[SUM]
+    dst[COUNT] = left[COUNT] + right[COUNT]
+
+
+@njit(cache=True, inline='always')
+def _st_pull(nodes, node):
+    _st_merge_rows(nodes[node], nodes[2 * node], nodes[2 * node + 1])
+
+
+@njit(cache=True)
+def _st_set_leaf(nodes, node, idx, data, valid):
+    row = nodes[node]
+    if valid[idx]:
+        val = np.int64(data[idx])
+        row[MAX], row[MIN], row[SUM], row[COUNT] = _pack_max(val, idx), _pack_min(val, idx), val, 1
+    else:
+        row[:] = nodes[0]
+
+
+@njit(cache=True)
+def _st_build(nodes, data, valid, size):
+    """ Fills the leaves at [size, size + n) and merges the levels bottom-up. """
+    for idx in range(len(data)):
+        _st_set_leaf(nodes, size + idx, idx, data, valid)
+    for node in range(size - 1, 0, -1):
+        _st_pull(nodes, node)
+
+
+@njit(cache=True)
+def _st_apply_add(nodes, lazy, size, node, val):
+    """ Adds `val` to every recorded day under `node`: applied to the node
+    itself and left pending for its children. """
+    row = nodes[node]
+    # A count of 0 means every day under this node has been removed, so
+    # there is nothing to shift here and nothing worth passing down: an
+    # empty leaf is always rewritten from data before it is used again.
+    if row[COUNT] == 0:
+        return
+    row[MAX] += val << 32
+    row[MIN] += val << 32
+    row[SUM] += val * row[COUNT]
+    if node < size:
+        tag = lazy[node]
+        # An addition after a pending assignment just changes what is assigned
+        if tag[HAS_SET]:
+            tag[SET] += val
+        else:
+            tag[ADD] += val
+
+
+@njit(cache=True)
+def _st_apply_set(nodes, lazy, size, n, node, height, val):
+    """ Records `val` on every real day under `node`, which spans 2^height
+    leaves: applied to the node itself and left pending for its children. """
+    first = (node << height) - size
+    days = min(n - first, 1 << height)
+    if days <= 0: # nothing but padding
+        return
+    row = nodes[node]
+    # Every day now holds `val`, so the earliest one is both max and min
+    row[MAX], row[MIN], row[SUM], row[COUNT] = _pack_max(val, first), _pack_min(val, first), val * days, days
+    if node < size:
+        tag = lazy[node]
+        tag[SET], tag[HAS_SET], tag[ADD] = val, 1, 0
+
+
+@njit(cache=True)
+def _st_push(nodes, lazy, size, n, node, height):
+    """ Hands the pending tag of `node` (2^height leaves) to its children. """
+    tag = lazy[node]
+    if tag[HAS_SET]:
+        _st_apply_set(nodes, lazy, size, n, 2 * node, height - 1, tag[SET])
+        _st_apply_set(nodes, lazy, size, n, 2 * node + 1, height - 1, tag[SET])
+        tag[HAS_SET] = 0
+    if tag[ADD] != 0:
+        _st_apply_add(nodes, lazy, size, 2 * node, tag[ADD])
+        _st_apply_add(nodes, lazy, size, 2 * node + 1, tag[ADD])
+        tag[ADD] = 0
+
+
+@njit(cache=True)
+def _st_push_boundaries(nodes, lazy, size, log, n, l, r):
+    """ Settles pending tags top-down on the ancestors of the half-open
+    leaf range [l, r) that are only partly inside it. """
+    for i in range(log, 0, -1):
+        if ((l >> i) << i) != l: _st_push(nodes, lazy, size, n, l >> i, i)
+        if ((r >> i) << i) != r: _st_push(nodes, lazy, size, n, (r - 1) >> i, i)
+
+
+@njit(cache=True)
+def _st_query(nodes, lazy, size, log, n, l, r, out):
+    """ Writes the (max key, min key, sum, count) row for [l, r] into `out`,
+    walking up from both boundary leaves. `out` accumulates the left part
+    and `right` the right one, so ties still go to the earlier day. """
+    l += size
+    r += size + 1
+    _st_push_boundaries(nodes, lazy, size, log, n, l, r)
+
+    # Row 0 is never a tree node and always holds the empty node
+    out[:] = nodes[0]
+    right = nodes[0].copy()
+    while l < r:
+        if l & 1:
+            _st_merge_rows(out, out, nodes[l])
+            l += 1
+        if r & 1:
+            r -= 1
+            _st_merge_rows(right, nodes[r], right)
+        l >>= 1
+        r >>= 1
+    _st_merge_rows(out, out, right)
+
+
+@njit(cache=True)
+def _st_update_point(nodes, lazy, size, log, n, data, valid, idx):
+    """ Rewrites leaf `idx` from data/valid: pushes its ancestors top-down,
+    then re-merges them bottom-up. """
+    leaf = size + idx
+    for i in range(log, 0, -1):
+        _st_push(nodes, lazy, size, n, leaf >> i, i)
+    _st_set_leaf(nodes, leaf, idx, data, valid)
+    for i in range(1, log + 1):
+        _st_pull(nodes, leaf >> i)
+
+
+@njit(cache=True)
+def _st_range_update(nodes, lazy, size, log, n, l, r, val, assign):
+    """ Assigns (assign=True) or adds `val` over [l, r]: tags the O(log n)
+    nodes that cover the range, then re-merges their partly covered ancestors. """
+    l += size
+    r += size + 1
+    _st_push_boundaries(nodes, lazy, size, log, n, l, r)
+
+    lo, hi, height = l, r, 0
+    while lo < hi:
+        if lo & 1:
+            if assign: _st_apply_set(nodes, lazy, size, n, lo, height, val)
+            else: _st_apply_add(nodes, lazy, size, lo, val)
+            lo += 1
+        if hi & 1:
+            hi -= 1
+            if assign: _st_apply_set(nodes, lazy, size, n, hi, height, val)
+            else: _st_apply_add(nodes, lazy, size, hi, val)
+        lo >>= 1
+        hi >>= 1
+        height += 1
+
+    for i in range(1, log + 1):
+        if ((l >> i) << i) != l: _st_pull(nodes, l >> i)
+        if ((r >> i) << i) != r: _st_pull(nodes, (r - 1) >> i)
+
+
+@njit(cache=True, parallel=True)
+def _moving_average_windows(csum, ccnt, k, out):
+    """ out[day] = average over [day - k, day + k] from the prefix sums of the
+    values (csum) and of the recorded-day counts (ccnt); every day is
+    independent, so the days are split across cores. """
+    n = len(out)
+    for day in prange(n):
+        start = min(max(day - k, 0), n)
+        end = min(max(day + k + 1, 0), n)
+        days = ccnt[end] - ccnt[start]
+        out[day] = (csum[end] - csum[start]) / days if days > 0 else 0.0
+
+
 class SegmentTree:
     """
     An advanced Segment Tree supporting complex nodes with counts for soft deletes
-    and lazy propagation for range additions.
+    and lazy propagation for range assignments and additions.
 
-    Node Structure: (max_val, max_idx, min_val, min_idx, sum, count)
+    Node Structure: (max_val, max_idx, min_val, min_idx, sum, count), stored
+    as one row of the int64 `nodes` table: packed (value, day) keys in
+    columns MAX and MIN, then SUM and COUNT.
+    Heap layout: root at 1, children of k at 2k and 2k + 1, and the leaves at
+    [size, size + n), size being n rounded up to a power of two.
     
     Time Complexity Summary:
-    - __init__: O(n) for building the tree from initial data.
-    - _merge_nodes: O(1) for combining two nodes.
-    - _build: O(n) for the recursive construction of the tree.
+    - __init__: O(n) for copying the initial data; the node table is built
+      (O(n)) on the first query, so reports that never query skip it.
+    - _st_merge_rows: O(1) for combining two nodes.
+    - _st_build: O(n) for the bottom-up construction of the tree.
     - query: O(log n) for the public range query method.
-    - _query_recursive: O(log n) for the internal recursive query logic.
-    - _apply_lazy: O(1) for applying a pending update to a single node.
+    - _st_query: O(log n) for the compiled iterative query logic.
+    - _st_apply_add / _st_apply_set: O(1) for applying a pending update to a single node.
+    - _st_push: O(1) for handing a node's pending update to its children.
     - update_point: O(log n) for the public point update method.
-    - _update_point_recursive: O(log n) for the internal recursive point update logic.
-    - update_range_add: O(log n) for range addition updates (not used in menu).
-    - _update_range_recursive: O(log n) for internal range update logic.
+    - _st_update_point: O(log n) for the compiled iterative point update logic.
+    - range_update: O(log n + k) for assigning or adding a value over k days: the
+      tree update is O(log n), the patch of data/valid is O(k), and the next
+      global_stats / query_static pays its O(n) / O(n log n) rebuild.
+    - _st_range_update: O(log n) for the compiled iterative range update logic.
+    - global_stats: O(n) NumPy reduction after an update, O(1) while cached.
+    - moving_average: O(n) for every centred window at once, via prefix sums.
+    - query_static: O(1) via a SparseTable, rebuilt in O(n log n) after an update.
     """
+    # Fixed attribute set: no per-instance __dict__, and faster attribute reads
+    __slots__ = ('data', 'valid', 'n', 'size', 'log', 'nodes', 'lazy', 'default_node',
+                 '_result', '_gen', '_stats', '_stats_gen', '_static', '_static_gen')
+
     def __init__(self, data):
-        self.data = data
-        self.n = len(data)
+        # Structure of arrays: dense int32 readings plus a parallel validity
+        # mask, so a soft-deleted day just clears its valid flag
+        self.data = np.array(data, dtype=np.int32)
+        self.valid = np.ones(len(self.data), dtype=np.uint8)
+        self.n = len(self.data)
         
         # NEW NODE: (max_val, max_idx, min_val, min_idx, sum, count)
         self.default_node = (-math.inf, -1, math.inf, -1, 0, 0)
         
-        self.tree = [self.default_node] * (4 * self.n)
-        self.lazy = [0] * (4 * self.n)
+        self.size = 1 if self.n <= 1 else 1 << (self.n - 1).bit_length()
+        self.log = self.size.bit_length() - 1
+        # Built from data/valid on the first query; until then updates only
+        # patch the flat arrays, which the build reads anyway
+        self.nodes = self.lazy = None
+        self._result = np.empty(4, dtype=np.int64) # reused by every query
         
+        # Every update bumps the generation; each cache below remembers the
+        # generation it was computed for and is stale once they differ
+        self._gen = 0
+        # Whole-array node, recomputed from self.data only after an update
+        self._stats, self._stats_gen = self.default_node, -1
+        # Built on first use by query_static and rebuilt after an update
+        self._static, self._static_gen = None, -1
+
+    def _build_nodes(self):
+        # Every row starts as the empty node; row 0 stays that way for good
+        self.nodes = np.tile(np.array([INT64_MIN, INT64_MAX, 0, 0], dtype=np.int64), (2 * self.size, 1))
+        self.lazy = np.zeros((self.size, 3), dtype=np.int64) # internal nodes only
         if self.n > 0:
-            self._build(0, 0, self.n - 1)
+            _st_build(self.nodes, self.data, self.valid, self.size)
 
-    def _merge_nodes(self, left_node, right_node):
-        max_v1, max_i1, min_v1, min_i1, sum1, count1 = left_node
-        max_v2, max_i2, min_v2, min_i2, sum2, count2 = right_node
+    def query(self, l, r):
+        # The leaves only span [0, n), so clamp like the recursive version did
+        l, r = max(l, 0), min(r, self.n - 1)
+        if l > r: return self.default_node
+        if self.nodes is None: self._build_nodes()
+        _st_query(self.nodes, self.lazy, self.size, self.log, self.n, l, r, self._result)
+        max_key, min_key, total_sum, count = self._result.tolist()
+        if count == 0: return self.default_node
+        return (*unpack_max(max_key), *unpack_min(min_key), total_sum, count)
 
-        # Determine overall max
-        if max_v1 >= max_v2: new_max_v, new_max_i = max_v1, max_i1
-        else: new_max_v, new_max_i = max_v2, max_i2
+    def update_point(self, idx, val):
+        if not (0 <= idx < self.n): return
+        if val is None: # None soft-deletes the day
+            self.valid[idx] = 0
+        else:
+            self.data[idx] = val
+            self.valid[idx] = 1
+        self._gen += 1
+        if self.nodes is None: return # The build will read the patched arrays
+        _st_update_point(self.nodes, self.lazy, self.size, self.log, self.n, self.data, self.valid, idx)
 
-        # Determine overall min
-        if min_v1 <= min_v2: new_min_v, new_min_i = min_v1, min_i1
-        else: new_min_v, new_min_i = min_v2, min_i2
-            
-        new_sum = sum1 + sum2
-        new_count = count1 + count2
-        
-        return (new_max_v, new_max_i, new_min_v, new_min_i, new_sum, new_count)
+    def range_update(self, l, r, val, mode='set'):
+        """Updates every day in [l, r]: mode='set' records `val` on all of them
+        (removed days included), mode='add' shifts the recorded days by `val`
+        and leaves removed days removed. The tree update is O(log n); patching
+        data/valid is O(r - l + 1)."""
+        if mode not in ('set', 'add'):
+            raise ValueError(f"Unknown range update mode: {mode!r}")
+        l, r = max(l, 0), min(r, self.n - 1)
+        if l > r: return
+        # Keep the flat arrays in step: leaves are rebuilt from them later
+        if mode == 'set':
+            self.data[l:r + 1] = val
+            self.valid[l:r + 1] = 1
+        else:
+            self.data[l:r + 1] += val
+        self._gen += 1
+        if self.nodes is None: return # The build will read the patched arrays
+        _st_range_update(self.nodes, self.lazy, self.size, self.log, self.n, l, r, val, mode == 'set')
 
-    def _build(self, node, start, end):
-        if start == end:
-            val = self.data[start]
-            if val is not None:
-                self.tree[node] = (val, start, val, start, val, 1)
+    def global_stats(self):
+        """Returns the node for the whole array, i.e. query(0, n - 1), computed
+        with NumPy reductions over the valid days and cached until the next update."""
+        if self._stats_gen != self._gen:
+            days = np.flatnonzero(self.valid)
+            if len(days) == 0:
+                self._stats = self.default_node
             else:
-                self.tree[node] = self.default_node
-            return
-        
-        mid = (start + end) // 2
-        self._build(2 * node + 1, start, mid)
-        self._build(2 * node + 2, mid + 1, end)
-        self.tree[node] = self._merge_nodes(self.tree[2 * node + 1], self.tree[2 * node + 2])
-
-    def _apply_lazy(self, node, start, end, val):
-        max_v, max_i, min_v, min_i, current_sum, current_count = self.tree[node]
-        # Lazy value affects sum based on how many valid nodes are in the range
-        # Min/max are also shifted by the lazy value.
-        if current_count > 0: # Only apply if there's data in the node
-             self.tree[node] = (max_v + val, max_i, min_v + val, min_i, current_sum + val * current_count, current_count)
-        if start != end:
-            self.lazy[2 * node + 1] += val
-            self.lazy[2 * node + 2] += val
-
-    def _query_recursive(self, node, start, end, l, r):
-        if self.lazy[node] != 0:
-            self._apply_lazy(node, start, end, self.lazy[node])
-            self.lazy[node] = 0
-
-        if start > r or end < l: return self.default_node
-        
-        if l <= start and end <= r: return self.tree[node]
-        
-        mid = (start + end) // 2
-        left_result = self._query_recursive(2 * node + 1, start, mid, l, r)
-        right_result = self._query_recursive(2 * node + 2, mid + 1, end, l, r)
-        
-        return self._merge_nodes(left_result, right_result)
-        
+                values = self.data[days].astype(np.int64)
+                # argmax/argmin return the first hit, the same earliest-day tie rule as _st_merge_rows
+                max_i, min_i = int(days[values.argmax()]), int(days[values.argmin()])
+                self._stats = (int(self.data[max_i]), max_i, int(self.data[min_i]), min_i, int(values.sum()), len(days))
+            self._stats_gen = self._gen
+        return self._stats
+
+    def moving_average(self, k):
+        """Returns the average of the recorded days in [day - k, day + k] for
+        every day (0 where a window has no data), from two prefix sums."""
+        values = np.where(self.valid, self.data, 0).astype(np.int64)
+        csum = np.concatenate(([0], values.cumsum()))
+        ccnt = np.concatenate(([0], self.valid.cumsum(dtype=np.int64)))
+        if HAVE_NUMBA:
+            out = np.empty(self.n)
+            _moving_average_windows(csum, ccnt, k, out)
+            return out
+
+        # Without Numba, the same windows as whole-array NumPy operations
+        days = np.arange(self.n)
+        starts = np.clip(days - k, 0, self.n)
+        ends = np.clip(days + k + 1, 0, self.n)
+        sums, counts = csum[ends] - csum[starts], ccnt[ends] - ccnt[starts]
+        # A negative k gives empty (or inverted) windows, which count as no data
+        return np.divide(sums, counts, out=np.zeros(self.n), where=counts > 0)
+
+    def query_static(self, l, r):
+        """Same result as query(l, r), answered in O(1) from a SparseTable of
+        the current data. Meant for read-heavy stretches between updates."""
+        if self._static_gen != self._gen:
+            self._static, self._static_gen = SparseTable(self.data, self.valid), self._gen
+        return self._static.query(l, r)
+
+
+class SparseTable:
+    """
+    An immutable range-query table over a snapshot of (data, valid): max/min
+    come from overlapping power-of-two blocks of packed (value, day) keys,
+    sum/count from prefix sums.
+
+    Node Structure: query returns (max_val, max_idx, min_val, min_idx, sum, count),
+    exactly like SegmentTree.query.
+
+    Time Complexity Summary:
+    - __init__: O(n log n) for building the block tables, one np.maximum /
+      np.minimum per level.
+    - query: O(1) for any range.
+    """
+    __slots__ = ('n', 'table_max', 'table_min', 'prefix_sum', 'prefix_count')
+
+    def __init__(self, data, valid):
+        self.n = len(data)
+        recorded = valid.astype(bool)
+        values = data.astype(np.int64)
+        days = np.arange(self.n, dtype=np.int64)
+
+        # table_max[k, i] is the max key of [i, i + 2^k); removed days get the
+        # sentinels, which lose every comparison
+        levels = max(self.n.bit_length(), 1)
+        self.table_max = np.full((levels, self.n), INT64_MIN, dtype=np.int64)
+        self.table_min = np.full((levels, self.n), INT64_MAX, dtype=np.int64)
+        self.table_max[0] = np.where(recorded, (values << 32) | (IDX_MASK - days), INT64_MIN)
+        self.table_min[0] = np.where(recorded, (values << 32) | days, INT64_MAX)
+        for k in range(1, levels):
+            half, count = 1 << (k - 1), self.n - (1 << k) + 1
+            np.maximum(self.table_max[k - 1, :count], self.table_max[k - 1, half:half + count], out=self.table_max[k, :count])
+            np.minimum(self.table_min[k - 1, :count], self.table_min[k - 1, half:half + count], out=self.table_min[k, :count])
+
+        self.prefix_sum = np.concatenate(([0], np.where(recorded, values, 0).cumsum()))
+        self.prefix_count = np.concatenate(([0], recorded.cumsum(dtype=np.int64)))
+
     def query(self, l, r):
-        if l > r or self.n == 0: return self.default_node
-        return self._query_recursive(0, 0, self.n - 1, l, r)
+        l, r = max(l, 0), min(r, self.n - 1)
+        if l > r: return (-math.inf, -1, math.inf, -1, 0, 0)
+        count = int(self.prefix_count[r + 1] - self.prefix_count[l])
+        if count == 0: return (-math.inf, -1, math.inf, -1, 0, 0)
 
-    def update_point(self, idx, val):
-        if not (0 <= idx < self.n): return
-        self.data[idx] = val # val can be a number or None for removal
-        self._update_point_recursive(0, 0, self.n - 1, idx)
-
-    def _update_point_recursive(self, node, start, end, idx):
-        if self.lazy[node] != 0:
-            self._apply_lazy(node, start, end, self.lazy[node])
-            self.lazy[node] = 0
-
-        if start == end:
-            val = self.data[idx]
-            if val is not None:
-                self.tree[node] = (val, idx, val, idx, val, 1)
-            else: # This handles the removal
-                self.tree[node] = self.default_node
-            return
-            
-        mid = (start + end) // 2
-        if start <= idx <= mid:
-            self._update_point_recursive(2 * node + 1, start, mid, idx)
-        else:
-            self._update_point_recursive(2 * node + 2, mid + 1, end, idx)
-            
-        self.tree[node] = self._merge_nodes(self.tree[2 * node + 1], self.tree[2 * node + 2])
+        # Two blocks of length 2^k cover [l, r]; overlapping is harmless for max/min.
+        # k = floor(log2(length)) comes straight from the length's bit count
+        k = (r - l + 1).bit_length() - 1
+        r_block = r - (1 << k) + 1
+        max_key = int(max(self.table_max[k, l], self.table_max[k, r_block]))
+        min_key = int(min(self.table_min[k, l], self.table_min[k, r_block]))
+        total_sum = int(self.prefix_sum[r + 1] - self.prefix_sum[l])
+        return (*unpack_max(max_key), *unpack_min(min_key), total_sum, count)
 
 # =================================================================================
 #  MENU-DRIVEN INTERFACE
 # =================================================================================
+CSV_CHUNK_ROWS = 1 << 20 # ~4 MB of int32 per pandas chunk
+
 def load_data_from_csv(filename):
-    """Loads data from a CSV file, returning a list of temperatures."""
+    """Loads data from a CSV file, returning an int32 array of temperatures.
+    The parsed array is saved next to the CSV as <csv>.cache.npy (a name no
+    user file of the same stem can collide with) behind a stamp of
+    the CSV's mtime (ns), byte size and row count; later runs read it back
+    instead of parsing the text again while the stamp matches exactly."""
+    cache = filename + '.cache.npy'
+    stamp = None
     try:
-        with open(filename, 'r') as f:
-            reader = csv.reader(f)
-            next(reader) # Skip header
-            return [int(row[0]) for row in reader]
+        stat = os.stat(filename)
+        stamp = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+        with open(cache, 'rb') as f:
+            saved = np.load(f) # (mtime_ns, size, rows), then the rows themselves
+            if np.array_equal(saved[:2], stamp):
+                data = np.load(f)
+                if len(data) == saved[2]:
+                    return data.astype(np.int32, copy=False)
+    except (OSError, ValueError, EOFError):
+        pass # No usable cache: parse the CSV below
+
+    try:
+        data = parse_csv(filename)
     except FileNotFoundError:
         print(f"❌ Error: Dataset file '{filename}' not found.")
         return None
-    except Exception as e:
+    except (OSError, ValueError) as e:
         print(f"❌ Error: Failed to load or parse data: {e}")
         return None
 
-def main():
-    """The main driver function to run the interactive program."""
+    if stamp is not None:
+        try:
+            with open(cache, 'wb') as f:
+                np.save(f, np.append(stamp, len(data)))
+                np.save(f, data)
+        except OSError:
+            pass # Read-only location: just parse again next time
+    return data
+
+def parse_csv(filename):
+    """Parses the first column of a CSV file with a header row into int32."""
+    # pandas is optional: it lets large datasets be read in bounded-size
+    # chunks. It is imported here, not at startup, since runs served from
+    # the .npy cache never parse and should not pay for the import.
+    try:
+        import pandas as pd
+    except ImportError:
+        # Parsed in C by NumPy; ndmin=1 keeps a single-day file one-dimensional
+        return np.loadtxt(filename, delimiter=',', skiprows=1, usecols=0, dtype=np.int32, ndmin=1)
+
+    # Count the lines first so the result is allocated once, then fill it
+    # chunk by chunk: peak memory is the array plus a single chunk. Counting
+    # newlines in 1 MB blocks keeps the count in C; with the header line
+    # present it is never below the number of data rows of a \n or \r\n file.
+    with open(filename, 'rb') as f:
+        capacity = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+    out = np.empty(capacity, dtype=np.int32)
+    filled = 0
+    for chunk in pd.read_csv(filename, usecols=[0], dtype=np.int32, chunksize=CSV_CHUNK_ROWS):
+        values = chunk.to_numpy().ravel()
+        if filled + len(values) > len(out):
+            # Lines ended by a bare \r were not counted; grow geometrically
+            grown = np.empty(max(2 * len(out), filled + len(values)), dtype=np.int32)
+            grown[:filled] = out[:filled]
+            out = grown
+        out[filled:filled + len(values)] = values
+        filled += len(values)
+    # Blank lines and a trailing newline are counted above but yield no rows
+    return out[:filled]
+
+def report_day(weather_tree, day):
+    """Choice 3: prints the reading recorded for one day. Like every report_*
+    helper, returns False when the request itself is invalid, else True."""
+    if not (0 <= day < weather_tree.n):
+        print("❌ Error: Invalid day.")
+        return False
+    elif weather_tree.valid[day]:
+        temp = weather_tree.data[day]
+        print(f"✅ Report for Day {day}: {temp}°C")
+    else:
+        print(f"✅ Report for Day {day}: No data recorded.")
+    return True
+
+def report_extremes(weather_tree):
+    """Choice 4: prints the hottest and coldest recorded days."""
+    result = weather_tree.global_stats()
+    max_v, max_i, min_v, min_i, _, _ = result
+    print("📈 Yearly Weather Extremes:")
+    if max_i != -1:
+        print(f"   - Hottest Day: {max_v}°C on Day {max_i}")
+        print(f"   - Coldest Day: {min_v}°C on Day {min_i}")
+    else:
+        print("   - No data available.")
+    return True
+
+def report_summary(weather_tree):
+    """Choice 5: prints the yearly average and the number of recorded days."""
+    result = weather_tree.global_stats()
+    _, _, _, _, total_sum, count = result
+    print("📊 Yearly Climate Summary:")
+    if count > 0:
+        avg = round(total_sum / count, 2)
+        print(f"   - Average Temperature: {avg}°C")
+        print(f"   - Total Valid Records: {count}")
+    else:
+        print("   - No data to generate a summary.")
+    return True
+
+def report_range(weather_tree, start, end, static=True):
+    """Choice 6: prints max, min and average over days [start, end]. With
+    static=False a single tree walk answers instead of the SparseTable, which
+    only pays off over many queries."""
+    if not (0 <= start <= end < weather_tree.n):
+        print("❌ Error: Invalid date range.")
+        return False
+    
+    # Range lookups dominate the menu, so it uses the O(1) table
+    result = weather_tree.query_static(start, end) if static else weather_tree.query(start, end)
+    max_v, max_i, min_v, min_i, total_sum, count = result
+    
+    print(f"🔍 Analytics for Days {start}-{end}:")
+    if count > 0:
+        avg = round(total_sum / count, 2)
+        print(f"   - Max Temp: {max_v}°C (on Day {max_i})")
+        print(f"   - Min Temp: {min_v}°C (on Day {min_i})")
+        print(f"   - Avg Temp: {avg}°C")
+    else:
+        print("   - No data in the selected range.")
+    return True
+
+def report_threshold(weather_tree, threshold, mode):
+    """Choice 7: prints every recorded day above or below a threshold."""
+    # Compare every recorded day at once instead of looping in Python
+    recorded = np.flatnonzero(weather_tree.valid)
+    temps = weather_tree.data[recorded].astype(np.int64)
+    if mode == "above": hits = temps > threshold
+    elif mode == "below": hits = temps < threshold
+    else: hits = np.zeros(len(temps), dtype=bool)
+    alerts = list(zip(recorded[hits].tolist(), temps[hits].tolist()))
+    
+    print(f"🚨 Found {len(alerts)} days {mode} {threshold}°C:")
+    if alerts:
+        print("   " + ", ".join([f"Day {d} ({t}°C)" for d, t in alerts]))
+    else:
+        print("   None.")
+    return True
+
+def report_moving_average(weather_tree, k):
+    """Choice 8: prints the start and end of the centred moving average."""
+    moving_averages = weather_tree.moving_average(k)
+    print(f"✅ Generated moving average report with a {k}-day window.")
+    print(f"   First {k} values:", [round(avg, 2) for avg in moving_averages[:k].tolist()])
+    print(f"   Last {k}  values:", [round(avg, 2) for avg in moving_averages[-k:].tolist()])
+    return True
+
+def interactive(filename):
+    """The menu-driven loop: one operation per prompt until the user exits."""
     print("☀️ Welcome to the Advanced Weather Analysis System!")
     print("-------------------------------------------------")
     
-    weather_data = load_data_from_csv("yearly_weather_data.csv")
+    weather_data = load_data_from_csv(filename)
     if weather_data is None:
         return
 
@@ -201,13 +661,19 @@ def main():
             choice = int(input("Enter your choice (1-9): "))
             
             if choice == 1: # Record/Update Weather Data
-                day = int(input(f"Enter Day to Update (0-{num_days-1}): "))
+                days = input(f"Enter Day to Update (0-{num_days-1}), or a range such as 10-20: ")
+                start, _, end = days.partition("-")
+                start = int(start)
+                end = int(end) if end else start
                 temp = int(input("Enter new temperature value: "))
-                if 0 <= day < num_days:
-                    weather_tree.update_point(day, temp)
-                    print(f"✅ Success: Day {day} updated to {temp}°C.")
-                else:
+                if not (0 <= start <= end < num_days):
                     print("❌ Error: Invalid day.")
+                elif start == end:
+                    weather_tree.update_point(start, temp)
+                    print(f"✅ Success: Day {start} updated to {temp}°C.")
+                else:
+                    weather_tree.range_update(start, end, temp, mode='set')
+                    print(f"✅ Success: Days {start}-{end} updated to {temp}°C.")
 
             elif choice == 2: # Remove Weather Data
                 day = int(input(f"Enter Day to Remove (0-{num_days-1}): "))
@@ -219,85 +685,27 @@ def main():
 
             elif choice == 3: # View Daily Report
                 day = int(input(f"Enter Day to View (0-{num_days-1}): "))
-                if 0 <= day < num_days:
-                    temp = weather_tree.data[day]
-                    if temp is not None:
-                        print(f"✅ Report for Day {day}: {temp}°C")
-                    else:
-                        print(f"✅ Report for Day {day}: No data recorded.")
-                else:
-                    print("❌ Error: Invalid day.")
+                report_day(weather_tree, day)
 
             elif choice == 4: # Check Weather Extremes
-                result = weather_tree.query(0, num_days - 1)
-                max_v, max_i, min_v, min_i, _, _ = result
-                print("📈 Yearly Weather Extremes:")
-                if max_i != -1:
-                    print(f"   - Hottest Day: {max_v}°C on Day {max_i}")
-                    print(f"   - Coldest Day: {min_v}°C on Day {min_i}")
-                else:
-                    print("   - No data available.")
+                report_extremes(weather_tree)
             
             elif choice == 5: # Generate Climate Summary
-                result = weather_tree.query(0, num_days - 1)
-                _, _, _, _, total_sum, count = result
-                print("📊 Yearly Climate Summary:")
-                if count > 0:
-                    avg = round(total_sum / count, 2)
-                    print(f"   - Average Temperature: {avg}°C")
-                    print(f"   - Total Valid Records: {count}")
-                else:
-                    print("   - No data to generate a summary.")
+                report_summary(weather_tree)
 
             elif choice == 6: # Analytics: Range Queries
                 start = int(input(f"Enter Start Day (0-{num_days-1}): "))
                 end = int(input(f"Enter End Day (0-{num_days-1}): "))
-                if not (0 <= start <= end < num_days):
-                    print("❌ Error: Invalid date range.")
-                    continue
-                
-                result = weather_tree.query(start, end)
-                max_v, max_i, min_v, min_i, total_sum, count = result
-                
-                print(f"🔍 Analytics for Days {start}-{end}:")
-                if count > 0:
-                    avg = round(total_sum / count, 2)
-                    print(f"   - Max Temp: {max_v}°C (on Day {max_i})")
-                    print(f"   - Min Temp: {min_v}°C (on Day {min_i})")
-                    print(f"   - Avg Temp: {avg}°C")
-                else:
-                    print("   - No data in the selected range.")
+                report_range(weather_tree, start, end)
 
             elif choice == 7: # Analytics: Threshold Alerts
                 threshold = int(input("Enter temperature threshold (°C): "))
                 mode = input("Find days [above] or [below] threshold? ").lower()
-                alerts = []
-                for day, temp in enumerate(weather_tree.data):
-                    if temp is None: continue
-                    if mode == "above" and temp > threshold:
-                        alerts.append((day, temp))
-                    elif mode == "below" and temp < threshold:
-                        alerts.append((day, temp))
-                
-                print(f"🚨 Found {len(alerts)} days {mode} {threshold}°C:")
-                if alerts:
-                    print("   " + ", ".join([f"Day {d} ({t}°C)" for d, t in alerts]))
-                else:
-                    print("   None.")
+                report_threshold(weather_tree, threshold, mode)
             
             elif choice == 8: # Seasonal Utilization Report
                 k = int(input("Enter window size for moving average (e.g., 7 for a weekly window): "))
-                moving_averages = []
-                print("Processing... This may take a moment.")
-                for day in range(num_days):
-                    start = max(0, day - k)
-                    end = min(num_days - 1, day + k)
-                    _, _, _, _, total_sum, count = weather_tree.query(start, end)
-                    avg = round(total_sum / count, 2) if count > 0 else 0
-                    moving_averages.append(avg)
-                print(f"✅ Generated moving average report with a {k}-day window.")
-                print(f"   First {k} values:", moving_averages[:k])
-                print(f"   Last {k}  values:", moving_averages[-k:])
+                report_moving_average(weather_tree, k)
 
             elif choice == 9:
                 print("Exiting the system. Goodbye!")
@@ -310,5 +718,55 @@ def main():
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+# =================================================================================
+#  COMMAND-LINE (BATCH) INTERFACE
+# =================================================================================
+def build_parser():
+    """One subcommand per read-only menu report, for scripted use."""
+    parser = argparse.ArgumentParser(description="Advanced Weather Analysis System")
+    parser.add_argument("--data", default="yearly_weather_data.csv", help="CSV dataset to analyse")
+    parser.add_argument("--interactive", action="store_true", help="run the menu (the default when no command is given)")
+    commands = parser.add_subparsers(dest="command")
+
+    command = commands.add_parser("day", help="daily report (menu choice 3)")
+    command.add_argument("day", type=int)
+    commands.add_parser("extremes", help="hottest and coldest days (menu choice 4)")
+    commands.add_parser("summary", help="yearly average and record count (menu choice 5)")
+    command = commands.add_parser("query", help="max/min/average over a range of days (menu choice 6)")
+    command.add_argument("start", type=int)
+    command.add_argument("end", type=int)
+    command = commands.add_parser("threshold", help="days above or below a temperature (menu choice 7)")
+    command.add_argument("mode", choices=("above", "below"))
+    command.add_argument("threshold", type=int)
+    command = commands.add_parser("moving-avg", help="centred moving average (menu choice 8)")
+    command.add_argument("k", type=int)
+    return parser
+
+def run_command(args, weather_tree):
+    """Runs the single report selected on the command line and returns
+    whether it succeeded."""
+    if args.command == "day": return report_day(weather_tree, args.day)
+    elif args.command == "extremes": return report_extremes(weather_tree)
+    elif args.command == "summary": return report_summary(weather_tree)
+    # One lookup per process: a single O(log n) walk beats building the table
+    elif args.command == "query": return report_range(weather_tree, args.start, args.end, static=False)
+    elif args.command == "threshold": return report_threshold(weather_tree, args.threshold, args.mode)
+    elif args.command == "moving-avg": return report_moving_average(weather_tree, args.k)
+    return False
+
+def main(argv=None):
+    """Entry point: the interactive menu, or one report per process when a
+    subcommand is given (e.g. `python project_1.py query 0 364`)."""
+    args = build_parser().parse_args(argv)
+    if args.interactive or args.command is None:
+        interactive(args.data)
+        return 0
+
+    weather_data = load_data_from_csv(args.data)
+    if weather_data is None:
+        return 1
+    # The node table is only built if the report queries it
+    return 0 if run_command(args, SegmentTree(weather_data)) else 1
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
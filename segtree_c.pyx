@@ -0,0 +1,153 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -march=native
+# =================================================================================
+#  COMPILED SEGMENT TREE CORE
+# =================================================================================
+#
+# Optional C implementation of the Segment Tree hot paths, used by
+# project.py when Numba is not installed. Build it in place with:
+#
+#     cythonize -i segtree_c.pyx
+#
+# SegmentTreeC does not own any data: it holds typed views onto the node
+# arrays of a project.SegmentTree (same heap layout, same lazy semantics),
+# so the Python class keeps building the tree and the two always agree.
+#
+# =================================================================================
+from libc.stdint cimport int64_t
+
+
+cdef class SegmentTreeC:
+    cdef int64_t[::1] max_v, max_i, min_v, min_i, sum_, lazy
+    cdef Py_ssize_t size, log
+
+    def __init__(self, max_v, max_i, min_v, min_i, sum_, lazy, size, log):
+        self.max_v = max_v
+        self.max_i = max_i
+        self.min_v = min_v
+        self.min_i = min_i
+        self.sum_ = sum_
+        self.lazy = lazy
+        self.size = size
+        self.log = log
+
+    cdef inline void _merge_into(self, Py_ssize_t dst, Py_ssize_t left, Py_ssize_t right) noexcept:
+        # Ties keep the left, earlier day
+        cdef Py_ssize_t src = left if self.max_v[left] >= self.max_v[right] else right
+        self.max_v[dst] = self.max_v[src]
+        self.max_i[dst] = self.max_i[src]
+        src = left if self.min_v[left] <= self.min_v[right] else right
+        self.min_v[dst] = self.min_v[src]
+        self.min_i[dst] = self.min_i[src]
+        self.sum_[dst] = self.sum_[left] + self.sum_[right]
+
+    cdef inline void _pull(self, Py_ssize_t node) noexcept:
+        cdef Py_ssize_t left = node << 1
+        self._merge_into(node, left, left | 1)
+
+    cdef inline void _apply_lazy(self, Py_ssize_t node, int64_t width, int64_t val) noexcept:
+        self.max_v[node] += val
+        self.min_v[node] += val
+        self.sum_[node] += val * width
+        if node < self.size:
+            self.lazy[node] += val
+
+    cdef inline void _push(self, Py_ssize_t node, int64_t width) noexcept:
+        cdef int64_t val = self.lazy[node]
+        cdef Py_ssize_t left = node << 1
+        if val != 0:
+            self._apply_lazy(left, width >> 1, val)
+            self._apply_lazy(left | 1, width >> 1, val)
+            self.lazy[node] = 0
+
+    cdef void _push_boundaries(self, Py_ssize_t l, Py_ssize_t r) noexcept:
+        cdef Py_ssize_t i
+        for i in range(self.log, 0, -1):
+            if ((l >> i) << i) != l: self._push(l >> i, 1 << i)
+            if ((r >> i) << i) != r: self._push((r - 1) >> i, 1 << i)
+
+    def query(self, Py_ssize_t l, Py_ssize_t r):
+        """ Iterative bottom-up query over [l, r]; node 0 holds the empty
+        sentinels and seeds the running bests. """
+        cdef Py_ssize_t left_max = 0, left_min = 0, right_max = 0, right_min = 0
+        cdef Py_ssize_t best_max, best_min
+        cdef int64_t total = 0
+        l += self.size
+        r += self.size + 1
+        self._push_boundaries(l, r)
+
+        while l < r:
+            if l & 1:
+                if self.max_v[l] > self.max_v[left_max]: left_max = l
+                if self.min_v[l] < self.min_v[left_min]: left_min = l
+                total += self.sum_[l]
+                l += 1
+            if r & 1:
+                r -= 1
+                if self.max_v[r] >= self.max_v[right_max]: right_max = r
+                if self.min_v[r] <= self.min_v[right_min]: right_min = r
+                total += self.sum_[r]
+            l >>= 1
+            r >>= 1
+
+        best_max = left_max if self.max_v[left_max] >= self.max_v[right_max] else right_max
+        best_min = left_min if self.min_v[left_min] <= self.min_v[right_min] else right_min
+        return (self.max_v[best_max], self.max_i[best_max],
+                self.min_v[best_min], self.min_i[best_min], total)
+
+    def update_range_add(self, Py_ssize_t l, Py_ssize_t r, int64_t val):
+        """ Iterative bottom-up range addition over [l, r]. """
+        cdef Py_ssize_t lo, hi, i, left_node
+        cdef int64_t width = 1
+        l += self.size
+        r += self.size + 1
+        self._push_boundaries(l, r)
+
+        lo, hi = l, r
+        while lo < hi:
+            if lo & 1:
+                self._apply_lazy(lo, width, val)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                self._apply_lazy(hi, width, val)
+            lo >>= 1
+            hi >>= 1
+            width <<= 1
+
+        for i in range(1, self.log + 1):
+            left_node = 0
+            if ((l >> i) << i) != l:
+                left_node = l >> i
+                self._pull(left_node)
+            if ((r >> i) << i) != r and ((r - 1) >> i) != left_node:
+                self._pull((r - 1) >> i)
+
+    def update_point(self, Py_ssize_t idx, int64_t val):
+        """ Sets element `idx` to `val`: pushes the leaf's ancestor path
+        top-down, sets the leaf, then re-merges the path bottom-up until a
+        node comes out unchanged. """
+        cdef Py_ssize_t leaf = idx + self.size, node, i
+        cdef int64_t old_max, old_min, old_sum
+        cdef Py_ssize_t old_max_i, old_min_i
+        for i in range(self.log, 0, -1):
+            self._push(leaf >> i, (<int64_t>1) << i)
+
+        if self.max_v[leaf] == val:
+            return
+        self.max_v[leaf] = val
+        self.min_v[leaf] = val
+        self.sum_[leaf] = val
+        self.max_i[leaf] = idx
+        self.min_i[leaf] = idx
+
+        for i in range(1, self.log + 1):
+            node = leaf >> i
+            old_max, old_max_i = self.max_v[node], self.max_i[node]
+            old_min, old_min_i = self.min_v[node], self.min_i[node]
+            old_sum = self.sum_[node]
+            self._pull(node)
+            if (self.max_v[node] == old_max and self.max_i[node] == old_max_i and
+                    self.min_v[node] == old_min and self.min_i[node] == old_min_i and
+                    self.sum_[node] == old_sum):
+                break